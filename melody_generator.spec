@@ -5,7 +5,7 @@ a = Analysis(
     ['src/main.py'],
     pathex=[],
     binaries=[],
-    datas=[('src/generator.py', '.'), ('src/gui.py', '.')],
+    datas=[('src/generator.py', '.'), ('src/gui.py', '.'), ('src/synth.py', '.'), ('src/kernel.py', '.'), ('src/exporters.py', '.'), ('src/similarity.py', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
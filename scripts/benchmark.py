@@ -0,0 +1,166 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+
+import kernel
+from exporters import WRITERS, export_batch
+from generator import MelodyGenerator
+from similarity import SimilarityIndex
+from synth import MelodySynth, render_batch
+
+
+def bench_render(measures=64, bpm=120):
+    """Real-time factor of rendering one melody to WAV"""
+    events = MelodyGenerator().generate_events(measures=measures)
+    synth = MelodySynth()
+    audio_seconds = synth.duration_seconds(events, bpm)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        synth.render_to_wav(events, bpm, os.path.join(output_dir, 'bench.wav'))
+        elapsed = time.perf_counter() - start
+
+    print(f"render: {audio_seconds:.1f}s audio in {elapsed:.3f}s "
+          f"(real-time factor {audio_seconds / elapsed:.1f}x)")
+
+
+def bench_render_batch(count=32, measures=16, bpm=120, workers=None):
+    """Real-time factor of rendering a batch across processes"""
+    jobs = [{'measures': measures, 'bpm': bpm, 'seed': seed} for seed in range(count)]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        paths = render_batch(jobs, output_dir, workers)
+        elapsed = time.perf_counter() - start
+        audio_seconds = 0.0
+        for path in paths:
+            with wave.open(path, 'rb') as wav_file:
+                audio_seconds += wav_file.getnframes() / wav_file.getframerate()
+
+    print(f"render_batch: {count} melodies, {audio_seconds:.1f}s audio in {elapsed:.3f}s "
+          f"(real-time factor {audio_seconds / elapsed:.1f}x)")
+
+
+def bench_export_batch(count=200, measures=16, workers=None):
+    """Throughput of exporting a batch to every format across processes"""
+    jobs = [{'measures': measures, 'seed': seed} for seed in range(count)]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        export_batch(jobs, output_dir, formats=tuple(WRITERS), workers=workers)
+        elapsed = time.perf_counter() - start
+
+    print(f"export_batch: {count} melodies x {len(WRITERS)} formats in {elapsed:.3f}s "
+          f"({count / elapsed:.0f} melodies/s)")
+
+
+def bench_similarity(count=20000, measures=1, mode='Pentatonic Major', capacity=100000):
+    """Dedup rate and per-melody cost of the similarity index"""
+    generator = MelodyGenerator()
+    index = SimilarityIndex(capacity=capacity)
+    melodies = [generator.generate_events(mode=mode, measures=measures) for _ in range(count)]
+
+    start = time.perf_counter()
+    for events in melodies:
+        index.add_if_new(events)
+    elapsed = time.perf_counter() - start
+
+    stats = index.stats()
+    print(f"similarity: {count} x {measures}-bar {mode} melodies, "
+          f"{elapsed / count * 1e6:.0f}us per melody, dedup rate {stats['dedup_rate']:.1%}, "
+          f"{stats['stored']} stored in {stats['memory_bytes'] / 2 ** 20:.1f} MiB")
+
+
+def bench_long_form(measure_counts=(1000, 10000, 100000), bpm=120):
+    """Peak traced memory of generate_long_melody as the piece grows"""
+    generator = MelodyGenerator()
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_path = os.path.join(output_dir, 'long.mid')
+        for measures in measure_counts:
+            tracemalloc.start()
+            start = time.perf_counter()
+            generator.generate_long_melody(measures=measures, bpm=bpm, output_path=output_path)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = os.path.getsize(output_path)
+            print(f"long form: {measures} measures in {elapsed:.2f}s, "
+                  f"{size / 2 ** 20:.1f} MiB written, peak memory {peak / 2 ** 10:.0f} KiB")
+
+
+def _reference_walks(generator, scale, melodies, note_count, contour, max_leap):
+    walks = np.empty((melodies, note_count), dtype=np.int64)
+    for row in range(melodies):
+        current_note = None
+        previous_notes = []
+        for column in range(note_count):
+            current_note = generator.apply_melodic_rules(
+                current_note, scale, previous_notes, contour, max_leap
+            )
+            previous_notes.append(current_note)
+            walks[row, column] = current_note
+    return walks
+
+
+def _walk_stats(walks):
+    intervals = np.abs(np.diff(walks, axis=1))
+    repeats = (walks[:, 2:] == walks[:, 1:-1]) & (walks[:, 1:-1] == walks[:, :-2])
+    return {
+        'mean interval': intervals.mean(),
+        'step rate (<=4)': (intervals <= 4).mean(),
+        'leap rate (>4)': (intervals > 4).mean(),
+        'triple repeat rate': repeats.mean(),
+        'mean pitch': walks.mean(),
+    }
+
+
+def bench_kernel(melodies=2000, note_count=32, contour='arch', max_leap=7):
+    """Speed and distribution check of kernel.walk/walk_batch against apply_melodic_rules"""
+    generator = MelodyGenerator()
+    scale = generator.get_scale('C', 'Major')
+
+    start = time.perf_counter()
+    reference = _reference_walks(generator, scale, melodies, note_count, contour, max_leap)
+    reference_time = time.perf_counter() - start
+
+    kernel.walk(scale, note_count, contour, max_leap)  # warm up the JIT, if any
+    start = time.perf_counter()
+    single = np.array([kernel.walk(scale, note_count, contour, max_leap, seed=seed)
+                       for seed in range(melodies)])
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = kernel.walk_batch(scale, melodies, note_count, contour, max_leap, seed=0)
+    batch_time = time.perf_counter() - start
+
+    backend = 'numba' if kernel.HAS_NUMBA else 'python'
+    print(f"kernel: {melodies} x {note_count} notes, contour={contour}")
+    print(f"  apply_melodic_rules {reference_time:.3f}s | walk ({backend}) {single_time:.3f}s "
+          f"| walk_batch {batch_time:.3f}s")
+    reference_stats = _walk_stats(reference)
+    single_stats = _walk_stats(single)
+    batch_stats = _walk_stats(batched)
+    for name in reference_stats:
+        print(f"  {name:<20} {reference_stats[name]:8.3f} {single_stats[name]:8.3f} "
+              f"{batch_stats[name]:8.3f}")
+
+    contour_error = np.abs(reference.mean(axis=0) - batched.mean(axis=0)).max()
+    print(f"  max per-position mean pitch difference: {contour_error:.3f}")
+
+
+if __name__ == '__main__':
+    bench_render()
+    bench_render_batch()
+    bench_export_batch()
+    bench_similarity()
+    bench_similarity(measures=8, mode='Major')
+    bench_long_form()
+    for contour in MelodyGenerator().contours:
+        bench_kernel(contour=contour)
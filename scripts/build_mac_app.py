@@ -16,6 +16,10 @@ def build_mac_app():
         '--icon=resources/icons/app_icon.icns',
         '--add-data=src/generator.py:.',
         '--add-data=src/gui.py:.',
+        '--add-data=src/synth.py:.',
+        '--add-data=src/kernel.py:.',
+        '--add-data=src/exporters.py:.',
+        '--add-data=src/similarity.py:.',
         '--clean',
         '--noconfirm'
     ])
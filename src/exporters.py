@@ -0,0 +1,286 @@
+import json
+import os
+from xml.sax.saxutils import escape
+
+from generator import MelodyGenerator, generate_job_events, run_batch
+
+
+TICKS_PER_BEAT = 480
+TICKS_PER_MEASURE = 1920
+TICKS_PER_UNIT = 120  # a sixteenth note, the shortest value the generator emits
+
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# Sixteenth counts that can be written as a single (possibly dotted) note
+NOTATED_LENGTHS = [16, 12, 8, 7, 6, 4, 3, 2, 1]
+NOTE_TYPES = {
+    16: ('whole', 0), 12: ('half', 1), 8: ('half', 0), 7: ('quarter', 2),
+    6: ('quarter', 1), 4: ('quarter', 0), 3: ('eighth', 1), 2: ('eighth', 0),
+    1: ('16th', 0)
+}
+
+ABC_MODES = {
+    'Major': '', 'Natural Minor': 'm', 'Harmonic Minor': 'm',
+    'Pentatonic Major': '', 'Pentatonic Minor': 'm', 'Dorian': 'dor',
+    'Phrygian': 'phr', 'Lydian': 'lyd', 'Mixolydian': 'mix',
+    'Aeolian': 'm', 'Locrian': 'loc'
+}
+
+
+def split_notated(duration, position):
+    """Split a duration at bar lines into notatable lengths, in sixteenths.
+
+    Yields (length, bar_start) pairs; bar_start is True for the first piece
+    of each new measure.
+    """
+    units = duration // TICKS_PER_UNIT
+    measure_units = TICKS_PER_MEASURE // TICKS_PER_UNIT
+    offset = (position // TICKS_PER_UNIT) % measure_units
+    while units > 0:
+        room = min(units, measure_units - offset)
+        for length in NOTATED_LENGTHS:
+            if length <= room:
+                break
+        yield length, offset == 0
+        units -= length
+        offset = (offset + length) % measure_units
+
+
+class EventWriter:
+    """Base class for writers that stream generator events to a file object"""
+
+    binary = False
+
+    def __init__(self, file, bpm, key, mode):
+        self.file = file
+        self.bpm = bpm
+        self.key = key
+        self.mode = mode
+        self.position = 0
+
+    def begin(self):
+        pass
+
+    def write(self, note, velocity, duration):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+    def feed(self, event):
+        self.write(*event)
+        self.position += event[2]
+
+    def padding(self):
+        """Ticks of rest needed to complete the last measure"""
+        return -self.position % TICKS_PER_MEASURE
+
+
+class MidiWriter(EventWriter):
+    binary = True
+
+    def begin(self):
+        # Standard MIDI files store track lengths up front, so the track is
+        # assembled in memory and written out at the end
+        self.events = []
+
+    def write(self, note, velocity, duration):
+        self.events.append((note, velocity, duration))
+
+    def end(self):
+        MelodyGenerator().build_midi(self.events, self.bpm).save(file=self.file)
+
+
+class JsonWriter(EventWriter):
+
+    def begin(self):
+        header = {'bpm': self.bpm, 'ticks_per_beat': TICKS_PER_BEAT,
+                  'key': self.key, 'mode': self.mode}
+        self.file.write(json.dumps(header)[:-1] + ', "events": [')
+        self.separator = '\n  '
+
+    def write(self, note, velocity, duration):
+        event = {'note': note, 'velocity': velocity, 'ticks': duration}
+        self.file.write(self.separator + json.dumps(event))
+        self.separator = ',\n  '
+
+    def end(self):
+        self.file.write('\n]}\n')
+
+
+class AbcWriter(EventWriter):
+
+    def begin(self):
+        self.file.write('X:1\n')
+        self.file.write(f'T:Melody in {self.key} {self.mode}\n')
+        self.file.write('M:4/4\nL:1/16\n')
+        self.file.write(f'Q:1/4={self.bpm}\n')
+        # Notes carry explicit accidentals, so the key line is only a label
+        self.file.write(f'K:C % {self.key}{ABC_MODES.get(self.mode, "")}\n')
+        self.accidentals = {}
+        self.bars = 0
+
+    def pitch(self, note):
+        name = NOTE_NAMES[note % 12]
+        octave = note // 12 - 1
+        letter = name[0]
+        alter = 1 if len(name) > 1 else 0
+
+        accidental = ''
+        if self.accidentals.get((letter, octave), 0) != alter:
+            accidental = '^' if alter else '='
+            self.accidentals[(letter, octave)] = alter
+
+        if octave >= 5:
+            return accidental + letter.lower() + "'" * (octave - 5)
+        return accidental + letter + ',' * (4 - octave)
+
+    def write(self, note, velocity, duration):
+        pieces = list(split_notated(duration, self.position))
+        for number, (length, bar_start) in enumerate(pieces):
+            if bar_start:
+                if self.bars:
+                    self.file.write('|\n' if self.bars % 4 == 0 else '| ')
+                self.bars += 1
+                self.accidentals = {}
+            symbol = 'z' if note is None else self.pitch(note)
+            tie = '-' if note is not None and number < len(pieces) - 1 else ''
+            self.file.write(symbol + (str(length) if length > 1 else '') + tie + ' ')
+
+    def end(self):
+        padding = self.padding()
+        if padding:
+            self.write(None, 0, padding)
+        self.file.write('|]\n')
+
+
+class MusicXmlWriter(EventWriter):
+
+    def begin(self):
+        self.measure = 0
+        self.file.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
+        self.file.write('<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 4.0 Partwise//EN" '
+                        '"http://www.musicxml.org/dtds/partwise.dtd">\n')
+        self.file.write('<score-partwise version="4.0">\n')
+        self.file.write(f'  <work><work-title>{escape(f"Melody in {self.key} {self.mode}")}'
+                        '</work-title></work>\n')
+        self.file.write('  <part-list>\n    <score-part id="P1"><part-name>Melody</part-name>'
+                        '</score-part>\n  </part-list>\n')
+        self.file.write('  <part id="P1">\n')
+
+    def open_measure(self):
+        if self.measure:
+            self.file.write('    </measure>\n')
+        self.measure += 1
+        self.file.write(f'    <measure number="{self.measure}">\n')
+        if self.measure == 1:
+            self.file.write('      <attributes><divisions>4</divisions><key><fifths>0</fifths></key>'
+                            '<time><beats>4</beats><beat-type>4</beat-type></time>'
+                            '<clef><sign>G</sign><line>2</line></clef></attributes>\n')
+            self.file.write(f'      <direction placement="above"><direction-type><metronome>'
+                            f'<beat-unit>quarter</beat-unit><per-minute>{self.bpm}</per-minute>'
+                            f'</metronome></direction-type><sound tempo="{self.bpm}"/></direction>\n')
+
+    def write(self, note, velocity, duration):
+        pieces = list(split_notated(duration, self.position))
+        for number, (length, bar_start) in enumerate(pieces):
+            if bar_start:
+                self.open_measure()
+            note_type, dots = NOTE_TYPES[length]
+
+            if note is None:
+                self.file.write('      <note><rest/>')
+            else:
+                name = NOTE_NAMES[note % 12]
+                alter = '<alter>1</alter>' if len(name) > 1 else ''
+                dynamics = round(velocity / 90 * 100, 2)
+                self.file.write(f'      <note dynamics="{dynamics}"><pitch><step>{name[0]}</step>'
+                                f'{alter}<octave>{note // 12 - 1}</octave></pitch>')
+            self.file.write(f'<duration>{length}</duration>')
+
+            ties = []
+            if note is not None and number > 0:
+                ties.append('stop')
+            if note is not None and number < len(pieces) - 1:
+                ties.append('start')
+            self.file.write(''.join(f'<tie type="{tie}"/>' for tie in ties))
+            self.file.write(f'<voice>1</voice><type>{note_type}</type>' + '<dot/>' * dots)
+            if ties:
+                self.file.write('<notations>' + ''.join(f'<tied type="{tie}"/>' for tie in ties)
+                                + '</notations>')
+            self.file.write('</note>\n')
+
+    def end(self):
+        padding = self.padding()
+        if padding:
+            self.write(None, 0, padding)
+        elif not self.measure:
+            # A part needs at least one measure, so an empty melody gets a bar's rest
+            self.write(None, 0, TICKS_PER_MEASURE)
+        self.file.write('    </measure>\n')
+        self.file.write('  </part>\n</score-partwise>\n')
+
+
+WRITERS = {
+    'mid': MidiWriter,
+    'musicxml': MusicXmlWriter,
+    'abc': AbcWriter,
+    'json': JsonWriter,
+}
+
+
+def export_events(events, outputs, bpm=MelodyGenerator.DEFAULT_BPM,
+                  key=MelodyGenerator.DEFAULT_KEY, mode=MelodyGenerator.DEFAULT_MODE):
+    """Write generator events to several formats in a single pass.
+
+    outputs maps a format name from WRITERS to a path or an open file object.
+    Returns the same mapping.
+    """
+    writers = []
+    opened = []
+    try:
+        for fmt, target in outputs.items():
+            if fmt not in WRITERS:
+                raise ValueError(f"Unknown export format: {fmt}")
+            writer_class = WRITERS[fmt]
+            if isinstance(target, (str, os.PathLike)):
+                if writer_class.binary:
+                    target = open(target, 'wb')
+                else:
+                    target = open(target, 'w', encoding='utf-8')
+                opened.append(target)
+            writers.append(writer_class(target, bpm, key, mode))
+
+        for writer in writers:
+            writer.begin()
+        for event in events:
+            for writer in writers:
+                writer.feed(event)
+        for writer in writers:
+            writer.end()
+    finally:
+        for file in opened:
+            file.close()
+
+    return outputs
+
+
+def _export_job(outputs, job):
+    events, bpm = generate_job_events(job)
+    return export_events(events, outputs, bpm,
+                         job.get('key', MelodyGenerator.DEFAULT_KEY),
+                         job.get('mode', MelodyGenerator.DEFAULT_MODE))
+
+
+def export_batch(jobs, output_dir, formats=('mid',), workers=None):
+    """Generate and export a batch of melodies across processes.
+
+    Each job is a dict of generate_events() arguments plus optional 'bpm',
+    'seed' and 'outputs'. Returns one {format: path} mapping per job, in job order.
+    """
+    return run_batch(
+        _export_job, jobs, output_dir, 'outputs',
+        lambda number: {fmt: os.path.join(output_dir, f'melody_{number:05d}.{fmt}')
+                        for fmt in formats},
+        workers
+    )
@@ -1,8 +1,54 @@
 import mido
 import random
 from mido import MidiFile, MidiTrack, Message
+from mido.midifiles.midifiles import encode_variable_int
 import os
+import struct
 import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+class NoteHistory:
+    """Stand-in for the previous_notes list that only keeps a short window.
+
+    apply_melodic_rules reads the last two notes and the note count, so the
+    count is tracked separately and older notes are dropped.
+    """
+
+    def __init__(self, window=2):
+        self.recent = deque(maxlen=window)
+        self.count = 0
+
+    def append(self, note):
+        self.recent.append(note)
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.recent[index]
+
+
+class TrackEncoder:
+    """Encode delta times and messages the way mido writes a track,
+    including running status, so a streamed track matches MidiFile.save.
+    """
+
+    def __init__(self):
+        self.running_status = None
+
+    def encode(self, delta, message):
+        data = message.bytes()
+        if message.is_meta:
+            self.running_status = None
+        else:
+            status = data[0]
+            if status == self.running_status:
+                data = data[1:]
+            self.running_status = status if status < 0xF0 else None
+        return bytes(encode_variable_int(delta) + data)
 
 
 class MelodyGenerator:
@@ -109,7 +155,9 @@ class MelodyGenerator:
         return scale[next_index]
 
     def get_rhythmic_pattern(self, measures=4, pattern_type='balanced'):
-        rhythms = []
+        return list(self.iter_rhythmic_pattern(measures, pattern_type))
+
+    def iter_rhythmic_pattern(self, measures=4, pattern_type='balanced'):
         total_ticks = measures * 1920
         
         if pattern_type == 'balanced':
@@ -130,27 +178,76 @@ class MelodyGenerator:
             if current_tick + duration > total_ticks:
                 duration = total_ticks - current_tick
             
-            rhythms.append(duration)
+            yield duration
             current_tick += duration
             
             if random.random() < 0.1 and current_tick < total_ticks:
                 rest_duration = random.choice([self.durations['sixteenth'], self.durations['eighth']])
                 if current_tick + rest_duration <= total_ticks:
-                    rhythms.append(-rest_duration)
+                    yield -rest_duration
                     current_tick += rest_duration
-        
-        return rhythms
 
     DEFAULT_KEY = 'C'
     DEFAULT_MODE = 'Major'
     DEFAULT_MEASURES = 4
     DEFAULT_BPM = 120
 
-    def generate_melody(self, key: str = DEFAULT_KEY, mode: str = DEFAULT_MODE, 
-                   measures: int = DEFAULT_MEASURES, bpm: int = DEFAULT_BPM,
-                   contour: str = 'arch', rhythm_type: str = 'balanced', 
-                   max_leap: int = 7, output_path: str = None) -> str:
+    def generate_events(self, key: str = DEFAULT_KEY, mode: str = DEFAULT_MODE,
+                        measures: int = DEFAULT_MEASURES, contour: str = 'arch',
+                        rhythm_type: str = 'balanced', max_leap: int = 7,
+                        accelerated: bool = False) -> list:
+        """Generate the melody as a list of (note, velocity, ticks) events.
 
+        Rests are represented with a note of None. This in-memory form is what
+        the MIDI writer and the audio renderer both consume. With accelerated
+        set, the pitch walk is produced in one call by kernel.walk instead of
+        note by note through apply_melodic_rules.
+        """
+        scale = self.get_scale(key, mode, octaves=2)
+        
+        rhythms = self.get_rhythmic_pattern(measures, rhythm_type)
+        
+        stable_degrees = [0, 2, 4]
+        current_note = scale[random.choice(stable_degrees)]
+        previous_notes = []
+        events = []
+
+        if accelerated:
+            import kernel
+            note_count = sum(1 for duration in rhythms if duration > 0)
+            pitches = iter(kernel.walk(scale, note_count, contour, max_leap,
+                                       seed=random.getrandbits(64)))
+
+        for duration in rhythms:
+            if duration < 0:
+                events.append((None, 0, abs(duration)))
+                continue
+                
+            if accelerated:
+                current_note = next(pitches)
+            else:
+                current_note = self.apply_melodic_rules(
+                    current_note, scale, previous_notes, contour, max_leap
+                )
+            previous_notes.append(current_note)
+            
+            if len(previous_notes) < len(rhythms) * 0.25:
+                velocity = random.randint(85, 100)
+            elif len(previous_notes) < len(rhythms) * 0.75:
+                velocity = random.randint(95, 115)
+            else:  # End
+                velocity = random.randint(80, 95)
+            
+            events.append((current_note, velocity, duration))
+
+        if previous_notes:
+            final_note = scale[random.choice([0, 4])]
+            events.append((final_note, 80, self.durations['quarter']))
+
+        return events
+
+    def build_midi(self, events, bpm: int = DEFAULT_BPM) -> MidiFile:
+        """Build a single-track MidiFile from generate_events() output"""
         mid = MidiFile(ticks_per_beat=480)
         track = MidiTrack()
         mid.tracks.append(track)
@@ -158,17 +255,50 @@ class MelodyGenerator:
         tempo = mido.bpm2tempo(bpm)
         track.append(mido.MetaMessage('set_tempo', tempo=tempo))
 
+        for note, velocity, duration in events:
+            if note is None:
+                track.append(Message('note_off', note=0, velocity=0, time=duration))
+                continue
+            track.append(Message('note_on', note=note, velocity=velocity, time=0))
+            track.append(Message('note_off', note=note, velocity=0, time=duration))
+
+        return mid
+
+    def generate_melody(self, key: str = DEFAULT_KEY, mode: str = DEFAULT_MODE, 
+                   measures: int = DEFAULT_MEASURES, bpm: int = DEFAULT_BPM,
+                   contour: str = 'arch', rhythm_type: str = 'balanced', 
+                   max_leap: int = 7, output_path: str = None) -> str:
+
+        events = self.generate_events(key, mode, measures, contour, rhythm_type, max_leap)
+        mid = self.build_midi(events, bpm)
+
+        if output_path is None:
+            output_path = os.path.join(tempfile.gettempdir(), f'melody_{key}_{mode}_{bpm}bpm.mid')
+
+        mid.save(output_path)
+        return output_path
+
+    def iter_long_events(self, key: str = DEFAULT_KEY, mode: str = DEFAULT_MODE,
+                         measures: int = DEFAULT_MEASURES, contour: str = 'arch',
+                         rhythm_type: str = 'balanced', max_leap: int = 7):
+        """Yield (note, velocity, ticks) events like generate_events, with
+        constant working memory.
+
+        Only the notes apply_melodic_rules reads are kept, and velocity
+        phrasing follows the running tick position instead of the note count.
+        """
         scale = self.get_scale(key, mode, octaves=2)
-        
-        rhythms = self.get_rhythmic_pattern(measures, rhythm_type)
+        total_ticks = measures * 1920
         
         stable_degrees = [0, 2, 4]
         current_note = scale[random.choice(stable_degrees)]
-        previous_notes = []
+        previous_notes = NoteHistory()
+        current_tick = 0
 
-        for duration in rhythms:
+        for duration in self.iter_rhythmic_pattern(measures, rhythm_type):
             if duration < 0:
-                track.append(Message('note_off', note=0, velocity=0, time=abs(duration)))
+                current_tick -= duration
+                yield (None, 0, abs(duration))
                 continue
                 
             current_note = self.apply_melodic_rules(
@@ -176,23 +306,99 @@ class MelodyGenerator:
             )
             previous_notes.append(current_note)
             
-            if len(previous_notes) < len(rhythms) * 0.25:
+            if current_tick < total_ticks * 0.25:
                 velocity = random.randint(85, 100)
-            elif len(previous_notes) < len(rhythms) * 0.75:
+            elif current_tick < total_ticks * 0.75:
                 velocity = random.randint(95, 115)
             else:  # End
                 velocity = random.randint(80, 95)
             
-            track.append(Message('note_on', note=current_note, velocity=velocity, time=0))
-            track.append(Message('note_off', note=current_note, velocity=0, time=duration))
+            current_tick += duration
+            yield (current_note, velocity, duration)
 
         if previous_notes:
             final_note = scale[random.choice([0, 4])]
-            track.append(Message('note_on', note=final_note, velocity=80, time=0))
-            track.append(Message('note_off', note=final_note, velocity=0, time=self.durations['quarter']))
+            yield (final_note, 80, self.durations['quarter'])
+
+    def generate_long_melody(self, key: str = DEFAULT_KEY, mode: str = DEFAULT_MODE,
+                             measures: int = DEFAULT_MEASURES, bpm: int = DEFAULT_BPM,
+                             contour: str = 'arch', rhythm_type: str = 'balanced',
+                             max_leap: int = 7, output_path: str = None,
+                             flush_bytes: int = 65536) -> str:
+        """Stream a long melody straight to a MIDI file.
 
+        Events come from iter_long_events and are encoded into a small buffer
+        that is flushed to disk every flush_bytes, so memory use does not grow
+        with measures. The track length is patched in once the track is done.
+        """
         if output_path is None:
-            output_path = os.path.join(tempfile.gettempdir(), f'melody_{key}_{mode}_{bpm}bpm.mid')
+            output_path = os.path.join(tempfile.gettempdir(), f'melody_{key}_{mode}_{bpm}bpm_long.mid')
 
-        mid.save(output_path)
-        return output_path
\ No newline at end of file
+        with open(output_path, 'wb') as midi_file:
+            midi_file.write(b'MThd' + struct.pack('>LHHH', 6, 0, 1, 480))
+            midi_file.write(b'MTrk')
+            length_offset = midi_file.tell()
+            midi_file.write(b'\0\0\0\0')
+
+            track_length = 0
+            buffer = bytearray()
+            encoder = TrackEncoder()
+            buffer += encoder.encode(0, mido.MetaMessage('set_tempo', tempo=mido.bpm2tempo(bpm)))
+
+            for note, velocity, duration in self.iter_long_events(
+                    key, mode, measures, contour, rhythm_type, max_leap):
+                if note is None:
+                    buffer += encoder.encode(duration, Message('note_off', note=0, velocity=0))
+                else:
+                    buffer += encoder.encode(0, Message('note_on', note=note, velocity=velocity))
+                    buffer += encoder.encode(duration, Message('note_off', note=note, velocity=0))
+
+                if len(buffer) >= flush_bytes:
+                    midi_file.write(buffer)
+                    track_length += len(buffer)
+                    buffer.clear()
+
+            buffer += encoder.encode(0, mido.MetaMessage('end_of_track'))
+            midi_file.write(buffer)
+            track_length += len(buffer)
+
+            if track_length > 0xFFFFFFFF:
+                raise ValueError(f"Track of {track_length} bytes exceeds the MIDI chunk size limit")
+            midi_file.seek(length_offset)
+            midi_file.write(struct.pack('>L', track_length))
+
+        return output_path
+
+
+def generate_job_events(job):
+    """Generate the events for one batch job inside a worker process.
+
+    job is a dict of generate_events() arguments plus optional 'bpm' and
+    'seed'. Returns (events, bpm).
+    """
+    job = dict(job)
+    bpm = job.pop('bpm', MelodyGenerator.DEFAULT_BPM)
+    # Forked workers inherit the parent's RNG state, so reseed every job
+    random.seed(job.pop('seed', None))
+    return MelodyGenerator().generate_events(**job), bpm
+
+
+def run_batch(worker, jobs, output_dir, output_field, default_output, workers=None):
+    """Run worker(output, job) for every job across a process pool.
+
+    Each job's output is taken from job[output_field], or default_output(number)
+    when the job does not set one. Returns the worker results in job order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    prepared = []
+    for number, job in enumerate(jobs):
+        job = dict(job)
+        if output_field in job:
+            outputs.append(job.pop(output_field))
+        else:
+            outputs.append(default_output(number))
+        prepared.append(job)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(worker, outputs, prepared))
@@ -1,6 +1,5 @@
 import sys
 import os
-import shutil
 import tempfile
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QGroupBox, QLabel, QComboBox,
@@ -10,6 +9,7 @@ from PyQt5.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCur
 from PyQt5.QtGui import QFont, QPainter
 from PyQt5.QtCore import pyqtProperty
 from generator import MelodyGenerator
+from exporters import export_events
 
 
 WINDOW_WIDTH = 800
@@ -19,6 +19,31 @@ MIN_HEIGHT = 500
 LAYOUT_MARGINS = 30
 LAYOUT_SPACING = 15
 
+EXPORT_FILTERS = {
+    "MIDI Files (*.mid *.midi)": ('mid', ('.mid', '.midi')),
+    "MusicXML Files (*.musicxml *.xml)": ('musicxml', ('.musicxml', '.xml')),
+    "ABC Notation (*.abc)": ('abc', ('.abc',)),
+    "JSON Events (*.json)": ('json', ('.json',)),
+}
+
+
+def export_target(file_path, selected_filter):
+    """Pick the export format from the chosen filter and fix up the extension"""
+    root, extension = os.path.splitext(file_path)
+    extension = extension.lower()
+    if selected_filter not in EXPORT_FILTERS:
+        # No filter reported; fall back to the extension, then to MIDI
+        selected_filter = next(
+            (name for name, (_, extensions) in EXPORT_FILTERS.items() if extension in extensions),
+            next(iter(EXPORT_FILTERS))
+        )
+
+    fmt, extensions = EXPORT_FILTERS[selected_filter]
+    if extension not in extensions:
+        known = any(extension in exts for _, exts in EXPORT_FILTERS.values())
+        file_path = (root if known else file_path) + extensions[0]
+    return fmt, file_path
+
 
 class FadeWidget(QWidget):
     """Custom widget with fade animation support"""
@@ -60,18 +85,18 @@ class GenerateThread(QThread):
         self.measures = measures
         self.bpm = bpm
         self.output_dir = output_dir
+        self.events = None
 
     def run(self):
         try:
             output_path = os.path.join(self.output_dir, f'melody_{self.key}_{self.mode}_{self.bpm}bpm.mid')
-            result_path = self.generator.generate_melody(
+            self.events = self.generator.generate_events(
                 key=self.key, 
                 mode=self.mode, 
-                measures=self.measures, 
-                bpm=self.bpm,
-                output_path=output_path
+                measures=self.measures
             )
-            self.finished.emit(result_path)
+            export_events(self.events, {'mid': output_path}, self.bpm, self.key, self.mode)
+            self.finished.emit(output_path)
         except Exception as e:
             self.error.emit(str(e))
 
@@ -82,6 +107,8 @@ class MelodyGeneratorApp(QMainWindow):
         super().__init__()
         self.generator = MelodyGenerator()
         self.current_midi_path = None
+        self.current_events = None
+        self.current_settings = None
         self._current_thread = None
         
         self.output_dir = tempfile.mkdtemp(prefix="melodies_")
@@ -196,7 +223,7 @@ class MelodyGeneratorApp(QMainWindow):
         self.generate_btn.setObjectName("generateButton")
         button_layout.addWidget(self.generate_btn)
 
-        self.save_btn = QPushButton("Save as MIDI")
+        self.save_btn = QPushButton("Save As...")
         self.save_btn.clicked.connect(self.save_melody)
         self.save_btn.setEnabled(False)
         self.save_btn.setObjectName("saveButton")
@@ -383,6 +410,9 @@ class MelodyGeneratorApp(QMainWindow):
         self.progress_bar.setVisible(False)
         self.save_btn.setEnabled(True)
         self.current_midi_path = file_path
+        self.current_events = self._current_thread.events
+        self.current_settings = (self._current_thread.bpm, self._current_thread.key,
+                                 self._current_thread.mode)
 
         self.log(f"Melody generated successfully!")
         self.log(f"File location: {file_path}")
@@ -406,15 +436,17 @@ class MelodyGeneratorApp(QMainWindow):
         success_animation.start()
 
     def save_melody(self):
-        """Save generated melody to user-selected location"""
-        if self.current_midi_path:
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "Save MIDI File",
+        """Save generated melody to user-selected location and format"""
+        if self.current_events:
+            file_path, selected_filter = QFileDialog.getSaveFileName(
+                self, "Save Melody",
                 os.path.expanduser("~/Desktop/My Melody.mid"),
-                "MIDI Files (*.mid)"
+                ";;".join(EXPORT_FILTERS)
             )
             if file_path:
-                shutil.copy2(self.current_midi_path, file_path)
+                fmt, file_path = export_target(file_path, selected_filter)
+                bpm, key, mode = self.current_settings
+                export_events(self.current_events, {fmt: file_path}, bpm, key, mode)
                 self.log(f"Melody saved to: {file_path}")
 
                 QMessageBox.information(
@@ -0,0 +1,144 @@
+import numpy as np
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+CONTOUR_RESOLUTION = 16.0
+STEP_PROBABILITY = 0.7
+STEP_OPTIONS = np.array([-2, -1, 1, 2])
+STABLE_DEGREES = np.array([0, 2, 4])
+MIN_LEAP = 3
+MAX_LEAP = 5
+
+# Uniform draws consumed per note: step/leap, step size or leap size, repeat escape
+DRAWS_PER_NOTE = 3
+
+
+def contour_targets(scale_length, note_count, contour='arch'):
+    """Target scale index per note, matching apply_melodic_rules' contour math"""
+    position = (np.arange(note_count) + 1) / CONTOUR_RESOLUTION
+    if contour == 'ascending':
+        target = scale_length * position
+    elif contour == 'descending':
+        target = scale_length * (1 - position)
+    elif contour == 'arch':
+        target = np.where(position < 0.5,
+                          scale_length * (position * 2),
+                          scale_length * (2 - position * 2))
+    elif contour == 'inverted_arch':
+        target = np.where(position < 0.5,
+                          scale_length * (1 - position * 2),
+                          scale_length * (position * 2 - 1))
+    else:
+        return np.full(note_count, scale_length // 2, dtype=np.int64)
+    return np.trunc(target).astype(np.int64)
+
+
+def _first_indices(scale):
+    # scale.index() resolves the shared octave note to its first occurrence
+    return np.array([scale.index(note) for note in scale], dtype=np.int64)
+
+
+def _leap_span(max_leap):
+    leap_high = min(MAX_LEAP, max_leap)
+    if leap_high < MIN_LEAP:
+        raise ValueError(f"max_leap must be at least {MIN_LEAP}, got {max_leap}")
+    return leap_high - MIN_LEAP + 1
+
+
+def _walk_loop(scale, first_index, targets, draws, leap_span, step_options, stable_degrees):
+    note_count = draws.shape[0]
+    scale_length = scale.shape[0]
+    notes = np.empty(note_count, dtype=np.int64)
+    if note_count == 0:
+        return notes
+
+    current_index = first_index[stable_degrees[int(draws[0, 1] * 3)]]
+    notes[0] = scale[current_index]
+
+    for i in range(1, note_count):
+        if draws[i, 0] < STEP_PROBABILITY:
+            next_index = current_index + step_options[int(draws[i, 1] * 4)]
+        else:
+            leap_size = MIN_LEAP + int(draws[i, 1] * leap_span)
+            direction = 1 if targets[i] > current_index else -1
+            next_index = current_index + leap_size * direction
+
+        next_index = max(0, min(scale_length - 1, next_index))
+
+        if i >= 2 and scale[next_index] == notes[i - 1] and notes[i - 1] == notes[i - 2]:
+            next_index = (next_index + step_options[int(draws[i, 2] * 4)]) % scale_length
+
+        # apply_melodic_rules' leap recovery compares the current note with
+        # previous_notes[-1], which generate_events has already set to that same
+        # note, so it never fires in a real walk and is left out here.
+        notes[i] = scale[next_index]
+        current_index = first_index[next_index]
+
+    return notes
+
+
+if HAS_NUMBA:
+    _walk_kernel = numba.njit(cache=True)(_walk_loop)
+else:
+    _walk_kernel = _walk_loop
+
+
+def walk(scale, note_count, contour='arch', max_leap=7, seed=None):
+    """Generate one melody's pitch sequence in a single call.
+
+    Uses a Numba-compiled loop when Numba is installed and falls back to the
+    same loop in pure Python otherwise.
+    """
+    rng = np.random.default_rng(seed)
+    draws = rng.random((note_count, DRAWS_PER_NOTE))
+    notes = _walk_kernel(
+        np.asarray(scale, dtype=np.int64), _first_indices(scale),
+        contour_targets(len(scale), note_count, contour), draws,
+        _leap_span(max_leap), STEP_OPTIONS, STABLE_DEGREES
+    )
+    return notes.tolist()
+
+
+def walk_batch(scale, melodies, note_count, contour='arch', max_leap=7, seed=None):
+    """Generate many pitch sequences at once, vectorized across melodies.
+
+    Returns an int64 array of shape (melodies, note_count).
+    """
+    rng = np.random.default_rng(seed)
+    draws = rng.random((melodies, note_count, DRAWS_PER_NOTE))
+    scale_array = np.asarray(scale, dtype=np.int64)
+    first_index = _first_indices(scale)
+    targets = contour_targets(len(scale), note_count, contour)
+    leap_span = _leap_span(max_leap)
+    scale_length = len(scale)
+
+    notes = np.empty((melodies, note_count), dtype=np.int64)
+    if note_count == 0:
+        return notes
+
+    current_index = first_index[STABLE_DEGREES[(draws[:, 0, 1] * 3).astype(np.int64)]]
+    notes[:, 0] = scale_array[current_index]
+
+    for i in range(1, note_count):
+        step = current_index + STEP_OPTIONS[(draws[:, i, 1] * 4).astype(np.int64)]
+        leap_size = MIN_LEAP + (draws[:, i, 1] * leap_span).astype(np.int64)
+        direction = np.where(targets[i] > current_index, 1, -1)
+        next_index = np.where(draws[:, i, 0] < STEP_PROBABILITY,
+                              step, current_index + leap_size * direction)
+        next_index = np.clip(next_index, 0, scale_length - 1)
+
+        if i >= 2:
+            repeated = ((scale_array[next_index] == notes[:, i - 1])
+                        & (notes[:, i - 1] == notes[:, i - 2]))
+            escape = next_index + STEP_OPTIONS[(draws[:, i, 2] * 4).astype(np.int64)]
+            next_index = np.where(repeated, escape % scale_length, next_index)
+
+        notes[:, i] = scale_array[next_index]
+        current_index = first_index[next_index]
+
+    return notes
@@ -0,0 +1,145 @@
+import numpy as np
+
+
+TICKS_PER_UNIT = 120
+MASK_64 = (1 << 64) - 1
+
+
+class SimilarityIndex:
+    """MinHash/LSH index for rejecting near-duplicate melodies.
+
+    Melodies are reduced to n-gram shingles of (interval, duration) tokens,
+    so transposed copies count as duplicates. Signatures live in a ring
+    buffer of `capacity` entries and the LSH buckets in fixed-size tables,
+    so memory stays constant however many melodies pass through; once full,
+    the oldest melodies are forgotten.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=3,
+                 capacity=100000, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.capacity = capacity
+        self.slots = capacity * 2
+
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd multipliers, top 32 bits of the product
+        self.hash_a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.hash_b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.band_weights = rng.integers(1, 2 ** 63, self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self.signatures = np.zeros((capacity, num_perm), dtype=np.uint32)
+        self.bucket_ids = np.full((bands, self.slots), -1, dtype=np.int64)
+        self.bucket_keys = np.zeros((bands, self.slots), dtype=np.uint32)
+
+        self.count = 0
+        self.seen = 0
+        self.rejected = 0
+
+    def shingles(self, events):
+        """Hash each run of shingle_size (interval, duration) tokens to uint64"""
+        tokens = []
+        previous = None
+        for note, _, duration in events:
+            if note is None:
+                interval = 255  # rests get their own interval symbol
+            else:
+                interval = 0 if previous is None else note - previous + 128
+                previous = note
+            tokens.append((interval << 16) | (duration // TICKS_PER_UNIT))
+
+        tokens = np.array(tokens or [0], dtype=np.uint64)
+        width = min(self.shingle_size, len(tokens))
+        hashes = np.zeros(len(tokens) - width + 1, dtype=np.uint64)
+        for offset in range(width):
+            hashes = hashes * np.uint64(1000003) + tokens[offset:offset + len(hashes)]
+        return np.unique(hashes)
+
+    def signature(self, events):
+        shingles = self.shingles(events)
+        hashed = (self.hash_a[:, None] * shingles[None, :] + self.hash_b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _bands(self, signature):
+        rows = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        keys = (rows * self.band_weights).sum(axis=1)
+        return keys % np.uint64(self.slots), (keys >> np.uint64(32)).astype(np.uint32)
+
+    def query(self, events, signature=None):
+        """Return (entry_id, similarity) of the closest stored match, or None"""
+        if signature is None:
+            signature = self.signature(events)
+        slots, keys = self._bands(signature)
+        band_range = np.arange(self.bands)
+
+        candidates = self.bucket_ids[band_range, slots]
+        live = ((candidates >= 0)
+                & (self.bucket_keys[band_range, slots] == keys)
+                & (candidates >= self.count - self.capacity))
+        candidates = np.unique(candidates[live])
+        if not len(candidates):
+            return None
+
+        similarity = (self.signatures[candidates % self.capacity] == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.threshold:
+            return None
+        return int(candidates[best]), float(similarity[best])
+
+    def add(self, events, signature=None):
+        """Store a melody unconditionally and return its entry id"""
+        if signature is None:
+            signature = self.signature(events)
+        entry_id = self.count
+        self.signatures[entry_id % self.capacity] = signature
+        slots, keys = self._bands(signature)
+        band_range = np.arange(self.bands)
+        self.bucket_ids[band_range, slots] = entry_id
+        self.bucket_keys[band_range, slots] = keys
+        self.count += 1
+        return entry_id
+
+    def add_if_new(self, events):
+        """Store the melody unless it near-duplicates one already stored.
+
+        Returns True if the melody was new and has been added.
+        """
+        signature = self.signature(events)
+        self.seen += 1
+        if self.query(events, signature) is not None:
+            self.rejected += 1
+            return False
+        self.add(events, signature)
+        return True
+
+    @property
+    def dedup_rate(self):
+        return self.rejected / self.seen if self.seen else 0.0
+
+    def stats(self):
+        return {
+            'seen': self.seen,
+            'rejected': self.rejected,
+            'stored': min(self.count, self.capacity),
+            'dedup_rate': self.dedup_rate,
+            'memory_bytes': (self.signatures.nbytes + self.bucket_ids.nbytes
+                             + self.bucket_keys.nbytes),
+        }
+
+
+def generate_unique_events(generator, index, count, max_attempts=10, **kwargs):
+    """Yield up to count melodies from generator.generate_events that the index
+    accepts as new, retrying each one at most max_attempts times.
+    """
+    for _ in range(count):
+        for _ in range(max_attempts):
+            events = generator.generate_events(**kwargs)
+            if index.add_if_new(events):
+                yield events
+                break
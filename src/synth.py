@@ -0,0 +1,98 @@
+import os
+import wave
+
+import numpy as np
+
+from generator import generate_job_events, run_batch
+
+
+TICKS_PER_BEAT = 480
+SAMPLE_RATE = 44100
+BLOCK_SIZE = 4096
+TABLE_SIZE = 2048
+
+
+class MelodySynth:
+    """Lightweight wavetable synth that renders generator events to PCM"""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE,
+                 harmonics=(1.0, 0.5, 0.25, 0.125), attack=0.005, release=0.03,
+                 gain=0.3):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.attack_samples = max(1, int(attack * sample_rate))
+        self.release_samples = max(1, int(release * sample_rate))
+        self.gain = gain
+
+        # One cycle of an additive waveform, looked up with a phase accumulator
+        phase = np.arange(TABLE_SIZE) * (2 * np.pi / TABLE_SIZE)
+        table = np.zeros(TABLE_SIZE)
+        for partial, amplitude in enumerate(harmonics, start=1):
+            table += amplitude * np.sin(partial * phase)
+        self.table = table / np.max(np.abs(table))
+
+    def ticks_to_samples(self, ticks, bpm):
+        seconds = ticks / TICKS_PER_BEAT * 60.0 / bpm
+        return int(round(seconds * self.sample_rate))
+
+    def render_blocks(self, events, bpm):
+        """Yield float32 blocks of at most block_size samples for the events"""
+        elapsed_ticks = 0
+        position = 0
+        for note, velocity, duration in events:
+            # Sample boundaries come from cumulative ticks so rounding never drifts
+            elapsed_ticks += duration
+            end = self.ticks_to_samples(elapsed_ticks, bpm)
+            length = end - position
+            position = end
+            if length <= 0:
+                continue
+
+            if note is None:
+                for start in range(0, length, self.block_size):
+                    yield np.zeros(min(self.block_size, length - start), dtype=np.float32)
+                continue
+
+            frequency = 440.0 * 2 ** ((note - 69) / 12.0)
+            increment = frequency * TABLE_SIZE / self.sample_rate
+            amplitude = self.gain * velocity / 127.0
+            for start in range(0, length, self.block_size):
+                index = np.arange(start, min(start + self.block_size, length))
+                samples = self.table[(index * increment).astype(np.int64) % TABLE_SIZE]
+                envelope = np.minimum(1.0, np.minimum(
+                    (index + 1) / self.attack_samples,
+                    (length - index) / self.release_samples
+                ))
+                yield (samples * envelope * amplitude).astype(np.float32)
+
+    def render_to_wav(self, events, bpm, output_path):
+        """Stream the rendered events to a 16-bit mono WAV file"""
+        with wave.open(output_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            for block in self.render_blocks(events, bpm):
+                pcm = np.clip(block, -1.0, 1.0) * 32767
+                wav_file.writeframes(pcm.astype('<i2').tobytes())
+        return output_path
+
+    def duration_seconds(self, events, bpm):
+        total_ticks = sum(duration for _, _, duration in events)
+        return self.ticks_to_samples(total_ticks, bpm) / self.sample_rate
+
+
+def _render_job(output_path, job):
+    events, bpm = generate_job_events(job)
+    return MelodySynth().render_to_wav(events, bpm, output_path)
+
+
+def render_batch(jobs, output_dir, workers=None):
+    """Generate and render a batch of melodies to WAV across processes.
+
+    Each job is a dict of generate_events() arguments plus optional 'bpm',
+    'seed' and 'output_path'. Returns the list of written WAV paths in job order.
+    """
+    return run_batch(
+        _render_job, jobs, output_dir, 'output_path',
+        lambda number: os.path.join(output_dir, f'melody_{number:05d}.wav'), workers
+    )
@@ -0,0 +1,127 @@
+import random
+
+import numpy as np
+import pytest
+
+import kernel
+from generator import MelodyGenerator
+
+
+CONTOURS = MelodyGenerator().contours
+SCALES = [('C', 'Major'), ('A', 'Pentatonic Minor'), ('F#', 'Locrian')]
+SEEDS = range(25)
+
+
+@pytest.fixture(params=['default', 'python'])
+def backend(request, monkeypatch):
+    """Run each test against the default kernel and the pure-Python fallback"""
+    if request.param == 'python':
+        monkeypatch.setattr(kernel, '_walk_kernel', kernel._walk_loop)
+    return request.param
+
+
+def _scale(key, mode):
+    return MelodyGenerator().get_scale(key, mode)
+
+
+def _reference_walks(scale, melodies, note_count, contour, max_leap=7, seed=0):
+    random.seed(seed)
+    generator = MelodyGenerator()
+    walks = np.empty((melodies, note_count), dtype=np.int64)
+    for row in range(melodies):
+        current_note = None
+        previous_notes = []
+        for column in range(note_count):
+            current_note = generator.apply_melodic_rules(
+                current_note, scale, previous_notes, contour, max_leap
+            )
+            previous_notes.append(current_note)
+            walks[row, column] = current_note
+    return walks
+
+
+def _positions(scale, note):
+    return [index for index, value in enumerate(scale) if value == note]
+
+
+def _check_walk(scale, notes, max_leap):
+    leap_high = min(kernel.MAX_LEAP, max_leap)
+    scale_length = len(scale)
+    duplicated = {note for note in scale if scale.count(note) > 1}
+
+    assert all(note in scale for note in notes)
+    for i in range(1, len(notes)):
+        current = scale.index(notes[i - 1])
+        distances = {abs(position - current) for position in _positions(scale, notes[i])}
+
+        if i >= 2 and notes[i - 1] == notes[i - 2]:
+            # The repeat escape moves up to two more degrees and wraps around
+            assert any(d <= leap_high + 2 or d >= scale_length - 3 for d in distances)
+        elif current in (0, scale_length - 1):
+            # A move off the edge of the scale is clipped back onto it
+            assert any(d <= leap_high for d in distances)
+        else:
+            assert any(1 <= d <= leap_high for d in distances)
+
+        if i >= 2 and notes[i] == notes[i - 1] == notes[i - 2]:
+            # Only the octave note shared by both halves of the scale can
+            # survive the escape, by stepping onto its duplicate
+            assert notes[i] in duplicated
+
+
+@pytest.mark.parametrize('contour', CONTOURS)
+def test_walk_matches_walk_batch(backend, contour):
+    scale = _scale('C', 'Major')
+    for seed in SEEDS:
+        single = kernel.walk(scale, 48, contour, seed=seed)
+        batched = kernel.walk_batch(scale, 1, 48, contour, seed=seed)[0]
+        assert single == batched.tolist()
+
+
+@pytest.mark.parametrize('key, mode', SCALES)
+@pytest.mark.parametrize('max_leap', [3, 4, 7])
+@pytest.mark.parametrize('contour', CONTOURS)
+def test_walk_follows_melodic_rules(backend, key, mode, max_leap, contour):
+    scale = _scale(key, mode)
+    for seed in SEEDS:
+        _check_walk(scale, kernel.walk(scale, 64, contour, max_leap, seed=seed), max_leap)
+
+
+@pytest.mark.parametrize('contour', CONTOURS)
+def test_walk_batch_follows_melodic_rules(contour):
+    scale = _scale('C', 'Major')
+    for notes in kernel.walk_batch(scale, 200, 64, contour, seed=1).tolist():
+        _check_walk(scale, notes, 7)
+
+
+def test_walk_rejects_small_max_leap():
+    with pytest.raises(ValueError):
+        kernel.walk(_scale('C', 'Major'), 8, max_leap=2)
+
+
+def test_empty_walk(backend):
+    scale = _scale('C', 'Major')
+    assert kernel.walk(scale, 0) == []
+    assert kernel.walk_batch(scale, 3, 0).shape == (3, 0)
+
+
+@pytest.mark.parametrize('contour', CONTOURS)
+def test_distribution_matches_apply_melodic_rules(contour):
+    scale = _scale('C', 'Major')
+    reference = _reference_walks(scale, 3000, 32, contour, seed=0)
+    batched = kernel.walk_batch(scale, 3000, 32, contour, seed=0)
+
+    reference_intervals = np.abs(np.diff(reference, axis=1))
+    batched_intervals = np.abs(np.diff(batched, axis=1))
+    assert abs(reference_intervals.mean() - batched_intervals.mean()) < 0.15
+    assert abs((reference_intervals <= 4).mean() - (batched_intervals <= 4).mean()) < 0.02
+    assert np.abs(reference.mean(axis=0) - batched.mean(axis=0)).max() < 0.6
+
+
+@pytest.mark.parametrize('contour', ['arch', 'descending'])
+def test_single_walk_distribution_matches_apply_melodic_rules(backend, contour):
+    scale = _scale('C', 'Major')
+    reference = _reference_walks(scale, 1000, 32, contour, seed=1)
+    single = np.array([kernel.walk(scale, 32, contour, seed=seed) for seed in range(1000)])
+
+    assert np.abs(reference.mean(axis=0) - single.mean(axis=0)).max() < 1.0
@@ -0,0 +1,38 @@
+import io
+import random
+
+import mido
+import pytest
+
+from generator import MelodyGenerator, NoteHistory
+
+
+def test_note_history_keeps_count_and_window():
+    history = NoteHistory()
+    assert not history
+    for note in [60, 62, 64, 65]:
+        history.append(note)
+    assert len(history) == 4
+    assert (history[-1], history[-2]) == (65, 64)
+
+
+@pytest.mark.parametrize('flush_bytes', [16, 65536])
+def test_long_melody_track_matches_mido(tmp_path, flush_bytes):
+    generator = MelodyGenerator()
+    output_path = str(tmp_path / 'long.mid')
+    for seed in range(10):
+        random.seed(seed)
+        generator.generate_long_melody(measures=12, bpm=90, mode='Dorian',
+                                       output_path=output_path, flush_bytes=flush_bytes)
+        random.seed(seed)
+        events = list(generator.iter_long_events(measures=12, mode='Dorian'))
+
+        expected = io.BytesIO()
+        generator.build_midi(events, 90).save(file=expected)
+        with open(output_path, 'rb') as midi_file:
+            written = midi_file.read()
+
+        # Skip the header, which declares format 0 instead of mido's default 1
+        assert written[14:] == expected.getvalue()[14:]
+        assert len(mido.MidiFile(output_path).tracks[0]) == len(events) * 2 + 2 - sum(
+            1 for note, _, _ in events if note is None)